@@ -0,0 +1,69 @@
+"""
+Benchmark for coalescing concurrent identical reads of /activities
+
+Simulates a burst of readers arriving right after a change and compares how
+often the activities are encoded with and without the shared encoding.
+
+Run with: python benchmarks/bench_coalescing.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import app
+
+READERS = 200
+ROUNDS = 20
+PARTICIPANTS_PER_ACTIVITY = 500
+
+
+def burst(read):
+    barrier = threading.Barrier(READERS)
+
+    def reader():
+        barrier.wait()
+        read()
+
+    threads = [threading.Thread(target=reader) for _ in range(READERS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def run(label, read, encodes):
+    elapsed = 0.0
+    for _ in range(ROUNDS):
+        app.mark_changed()
+        elapsed += burst(read)
+    print(f"{label:<14} {elapsed / ROUNDS * 1000:8.2f} ms/burst "
+          f"{encodes[0] / ROUNDS:8.1f} encodes/burst")
+
+
+if __name__ == "__main__":
+    for name, activity in app.activities.items():
+        activity["participants"] = [
+            f"student{i}@mergington.edu" for i in range(PARTICIPANTS_PER_ACTIVITY)
+        ]
+
+    encodes = [0]
+
+    def build():
+        encodes[0] += 1
+        return app.activities
+
+    def uncoalesced():
+        encodes[0] += 1
+        json.dumps(app.activities, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    print(f"{READERS} concurrent readers, {ROUNDS} rounds")
+    run("independent", uncoalesced, encodes)
+    encodes[0] = 0
+    run("coalesced", lambda: app.encoded_response("bench", build), encodes)
@@ -0,0 +1,38 @@
+"""
+Benchmark for email validation and normalization on the signup hot path
+
+Run with: python benchmarks/bench_email.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app import normalize_email
+
+ITERATIONS = 100_000
+
+
+def report(label, seconds):
+    print(f"{label:<28} {seconds / ITERATIONS * 1e6:8.3f} us/call")
+
+
+if __name__ == "__main__":
+    email = "  Emma@Mergington.edu "
+
+    normalize_email.cache_clear()
+    uncached = timeit.timeit(
+        lambda: normalize_email.__wrapped__(email), number=ITERATIONS
+    )
+    report("normalize (uncached)", uncached)
+
+    normalize_email(email)
+    cached = timeit.timeit(lambda: normalize_email(email), number=ITERATIONS)
+    report("normalize (cached)", cached)
+
+    invalid = timeit.timeit(
+        lambda: normalize_email.__wrapped__("student@gmail.com"), number=ITERATIONS
+    )
+    report("reject (uncached)", invalid)
@@ -0,0 +1,59 @@
+"""
+Benchmark comparing time to first render of the activities page
+
+The current flow loads index.html, then app.js and styles.css, and only then
+fetches /activities. The bootstrap page carries the activities inline, so the
+first render only waits for the page and its assets. Each stage costs one
+simulated network round trip plus the slowest server response in that stage.
+
+Run with: python benchmarks/bench_first_render.py
+"""
+
+import os
+import sys
+import time
+import warnings
+
+warnings.filterwarnings("ignore")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import app
+
+ROUND_TRIP = 0.050
+ITERATIONS = 200
+
+CURRENT_FLOW = [
+    ["/static/index.html"],
+    ["/static/styles.css", "/static/app.js"],
+    ["/activities"],
+]
+BOOTSTRAP_FLOW = [
+    ["/bootstrap"],
+    ["/static/styles.css", "/static/app.js"],
+]
+
+
+def time_to_first_render(client, stages):
+    total = 0.0
+    for stage in stages:
+        slowest = 0.0
+        for path in stage:
+            start = time.perf_counter()
+            client.get(path)
+            slowest = max(slowest, time.perf_counter() - start)
+        total += ROUND_TRIP + slowest
+    return total
+
+
+def report(label, client, stages):
+    elapsed = sum(time_to_first_render(client, stages) for _ in range(ITERATIONS)) / ITERATIONS
+    print(f"{label:<10} {len(stages)} round trips {elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    client = TestClient(app.app)
+    print(f"Simulated round trip: {ROUND_TRIP * 1000:.0f} ms")
+    report("current", client, CURRENT_FLOW)
+    report("bootstrap", client, BOOTSTRAP_FLOW)
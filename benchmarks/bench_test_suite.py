@@ -0,0 +1,35 @@
+"""
+Benchmark for the wall-clock time of the test suite
+
+Runs the suite serially and with pytest-xdist, reporting the best of a few runs.
+
+Run with: python benchmarks/bench_test_suite.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+RUNS = 3
+
+CONFIGURATIONS = {
+    "serial": [],
+    "parallel": ["-n", "auto"],
+}
+
+
+def run_suite(extra_args):
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *extra_args],
+        cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for label, args in CONFIGURATIONS.items():
+        best = min(run_suite(args) for _ in range(RUNS))
+        print(f"{label:<10} {best:8.2f} s")
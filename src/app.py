@@ -5,10 +5,26 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse, Response
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+import contextvars
+import functools
+import inspect
+import itertools
+import json
 import os
+import random
+import re
+import sys
+import threading
+import time
 from pathlib import Path
 
 app = FastAPI(title="Mergington High School API",
@@ -77,15 +93,519 @@ activities = {
     }
 }
 
+# Only school addresses may sign up. The allow-list is compiled into a single
+# pattern so validating an address is one regex match.
+ALLOWED_EMAIL_DOMAINS = ("mergington.edu",)
+_EMAIL_PATTERN = re.compile(
+    r"[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:" + "|".join(re.escape(domain) for domain in ALLOWED_EMAIL_DOMAINS) + r")"
+)
+
+
+@lru_cache(maxsize=4096)
+def normalize_email(email: str) -> Optional[str]:
+    """Return the canonical form of an email address, or None if it is not allowed"""
+    normalized = email.strip().lower()
+    if _EMAIL_PATTERN.fullmatch(normalized):
+        return normalized
+    return None
+
+
+# Append-only history of enrollment changes, kept per activity in time order.
+# Each activity holds a list of events plus a parallel list of timestamps (in
+# microseconds since the epoch) that serves as the time index for `since` queries.
+HISTORY_LIMIT_PER_ACTIVITY = 10000
+HISTORY_SEGMENT_SIZE = 1000
+
+activity_history = {}
+_history_times = {}
+# Id and timestamp of the newest event evicted from each activity's history
+_history_evicted = {}
+_history_ids = itertools.count(1)
+_history_lock = threading.Lock()
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_last_history_time = 0
+
+
+def record_event(activity_name: str, action: str, email: str):
+    """Append an enrollment change to the activity's history"""
+    global _last_history_time
+    with _history_lock:
+        # Never let the clock go backwards so the time index stays sorted
+        timestamp = max(time.time_ns() // 1000, _last_history_time)
+        _last_history_time = timestamp
+        events = activity_history.setdefault(activity_name, [])
+        times = _history_times.setdefault(activity_name, [])
+        events.append({
+            "id": next(_history_ids),
+            "timestamp": (_EPOCH + timedelta(microseconds=timestamp)).isoformat(),
+            "action": action,
+            "email": email,
+        })
+        times.append(timestamp)
+        # Drop whole segments of the oldest events rather than one at a time
+        if len(events) > HISTORY_LIMIT_PER_ACTIVITY + HISTORY_SEGMENT_SIZE:
+            _history_evicted[activity_name] = (
+                events[HISTORY_SEGMENT_SIZE - 1]["id"], times[HISTORY_SEGMENT_SIZE - 1]
+            )
+            del events[:HISTORY_SEGMENT_SIZE]
+            del times[:HISTORY_SEGMENT_SIZE]
+
+
+def clear_history():
+    """Forget all recorded enrollment changes"""
+    with _history_lock:
+        activity_history.clear()
+        _history_times.clear()
+        _history_evicted.clear()
+
+
+class Leaderboard:
+    """Counts per key, kept in buckets by count so the top entries are cheap to read"""
+
+    def __init__(self):
+        self.counts = {}
+        self.buckets = {}
+        self.max_count = 0
+        self.total = 0
+
+    def _move(self, key, old, new):
+        if old:
+            bucket = self.buckets[old]
+            del bucket[key]
+            if not bucket:
+                del self.buckets[old]
+        if new:
+            self.buckets.setdefault(new, {})[key] = None
+            self.counts[key] = new
+        else:
+            del self.counts[key]
+
+    def increment(self, key):
+        old = self.counts.get(key, 0)
+        self._move(key, old, old + 1)
+        self.total += 1
+        self.max_count = max(self.max_count, old + 1)
+
+    def decrement(self, key):
+        old = self.counts.get(key, 0)
+        if not old:
+            return
+        self._move(key, old, old - 1)
+        self.total -= 1
+        # The key itself now sits one bucket lower, so that bucket is never empty
+        if old == self.max_count and old not in self.buckets:
+            self.max_count -= 1
+
+    def top(self, k: int):
+        """Return up to k (key, count) pairs, highest count first"""
+        result = []
+        count = self.max_count
+        while count > 0 and len(result) < k:
+            for key in self.buckets.get(count, ()):
+                result.append((key, count))
+                if len(result) == k:
+                    break
+            count -= 1
+        return result
+
+
+# Aggregate statistics, updated on every signup and removal. Endpoints run
+# concurrently in a threadpool, so updates and reads hold _stats_lock.
+activity_counts = Leaderboard()
+student_counts = Leaderboard()
+_stats_lock = threading.Lock()
+
+
+def count_signup(activity_name: str, email: str):
+    with _stats_lock:
+        activity_counts.increment(activity_name)
+        student_counts.increment(email)
+
+
+def count_removal(activity_name: str, email: str):
+    with _stats_lock:
+        activity_counts.decrement(activity_name)
+        student_counts.decrement(email)
+
+
+def rebuild_stats():
+    """Recompute the aggregate statistics from the activities database"""
+    global activity_counts, student_counts
+    new_activity_counts = Leaderboard()
+    new_student_counts = Leaderboard()
+    for name, activity in activities.items():
+        for email in activity["participants"]:
+            new_activity_counts.increment(name)
+            new_student_counts.increment(email)
+    with _stats_lock:
+        activity_counts = new_activity_counts
+        student_counts = new_student_counts
+
+
+rebuild_stats()
+
+
+class SingleFlight:
+    """Run one computation per key at a time and share its result with concurrent callers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event()}
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as exc:
+            call["error"] = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+
+# Version of the activities data, bumped on every change. Encoded read responses
+# are cached per version and concurrent requests for the same version share one
+# encoding instead of each serializing the same data.
+state_version = 0
+_state_lock = threading.Lock()
+_encoded_responses = {}
+_read_flight = SingleFlight()
+
+
+def mark_changed():
+    """Invalidate cached read responses after the activities data changed"""
+    global state_version
+    with _state_lock:
+        state_version += 1
+
+
+def snapshot_state():
+    """Capture the activities database so it can be restored later"""
+    return {
+        name: {**activity, "participants": list(activity["participants"])}
+        for name, activity in activities.items()
+    }
+
+
+def restore_state(snapshot):
+    """Reset the activities database to a snapshot and drop everything derived from it"""
+    activities.clear()
+    activities.update(
+        (name, {**activity, "participants": list(activity["participants"])})
+        for name, activity in snapshot.items()
+    )
+    clear_history()
+    rebuild_stats()
+    mark_changed()
+
+
+def cached_response(name: str, render):
+    """Return the bytes for a read endpoint, rendering them at most once per version"""
+    version = state_version
+    cached = _encoded_responses.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    def render_and_cache():
+        body = render()
+        # A slow render must not replace an entry already cached for a newer version
+        with _state_lock:
+            current = _encoded_responses.get(name)
+            if current is None or current[0] <= version:
+                _encoded_responses[name] = (version, body)
+        return body
+
+    return _read_flight.do((name, version), render_and_cache)
+
+
+def encoded_response(name: str, build):
+    """Return the JSON bytes for a read endpoint, encoding them at most once per version"""
+    return cached_response(
+        name,
+        lambda: json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    )
+
+
+# Opt-in sampling profiler. PROFILE_SAMPLE_RATE (0 to 1) selects the fraction of
+# requests to profile, and with PROFILE_ALLOW_HEADER set a request with an
+# "X-Profile: 1" header is always profiled. While a profiled request is in flight
+# a background thread samples, every PROFILE_INTERVAL seconds, the stacks of the
+# threads working on it: the event loop thread for the async phases, and the
+# threadpool worker while a sync endpoint runs. Without either setting the
+# middleware, route class and admin routes are not installed.
+def _float_setting(name: str, default: str) -> float:
+    value = os.environ.get(name, default)
+    try:
+        return float(value)
+    except ValueError:
+        raise RuntimeError(f"{name} must be a number, got {value!r}") from None
+
+
+PROFILE_SAMPLE_RATE = _float_setting("PROFILE_SAMPLE_RATE", "0")
+if not 0 <= PROFILE_SAMPLE_RATE <= 1:
+    raise RuntimeError(f"PROFILE_SAMPLE_RATE must be between 0 and 1, got {PROFILE_SAMPLE_RATE}")
+PROFILE_ALLOW_HEADER = os.environ.get("PROFILE_ALLOW_HEADER", "").lower() in ("1", "true", "yes")
+PROFILE_INTERVAL = _float_setting("PROFILE_INTERVAL", "0.001")
+if not PROFILE_INTERVAL > 0:
+    raise RuntimeError(f"PROFILE_INTERVAL must be greater than 0, got {PROFILE_INTERVAL}")
+PROFILING_ENABLED = PROFILE_SAMPLE_RATE > 0 or PROFILE_ALLOW_HEADER
+
+# Threads whose innermost frame is in one of these modules are waiting, not working
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py", os.path.join("concurrent", "futures", "thread.py"))
+
+
+class StackSampler:
+    """Aggregates sampled stacks of the threads serving profiled requests"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self.requests = 0
+        self.samples = 0
+        self._threads = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+
+    def track_thread(self, ident: int):
+        """Sample the given thread until the matching untrack_thread call"""
+        with self._lock:
+            self._threads[ident] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+    def untrack_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] -= 1
+            if not self._threads[ident]:
+                del self._threads[ident]
+
+    def start_request(self):
+        with self._lock:
+            self.requests += 1
+        self.track_thread(threading.get_ident())
+
+    def end_request(self):
+        self.untrack_thread(threading.get_ident())
+
+    def _run(self):
+        while True:
+            with self._wake:
+                while not self._threads:
+                    self._wake.wait()
+            self.sample()
+            time.sleep(self.interval)
+
+    def sample(self):
+        """Record the current stack of every tracked thread that is not idle"""
+        with self._lock:
+            idents = list(self._threads)
+        frames = sys._current_frames()
+        collected = []
+        for ident in idents:
+            frame = frames.get(ident)
+            if frame is None or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            collected.append(";".join(reversed(stack)))
+        with self._lock:
+            self.stacks.update(collected)
+            self.samples += len(collected)
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope"""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, n: int):
+        """Functions that were on top of the stack most often"""
+        leaves = Counter()
+        with self._lock:
+            for stack, count in self.stacks.items():
+                leaves[stack.rpartition(";")[2]] += count
+            total = self.samples
+        return [
+            {"function": function, "samples": count, "fraction": count / total}
+            for function, count in leaves.most_common(n)
+        ]
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.requests = 0
+            self.samples = 0
+
+
+profiler = StackSampler(PROFILE_INTERVAL)
+# Set while the middleware is handling a profiled request; copied into threadpool calls
+_profiled_request = contextvars.ContextVar("profiled_request", default=False)
+
+
+class ProfilingMiddleware:
+    """Profiles sampled requests; only installed when profiling is configured"""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _should_profile(scope) -> bool:
+        if scope["path"].startswith("/admin/"):
+            return False
+        if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+            return True
+        return PROFILE_ALLOW_HEADER and (b"x-profile", b"1") in scope["headers"]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler.start_request()
+        token = _profiled_request.set(True)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _profiled_request.reset(token)
+            profiler.end_request()
+
+
+def _track_profiled_thread(endpoint):
+    """Wrap a sync endpoint so the sampler follows profiled requests into the threadpool"""
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        if not _profiled_request.get():
+            return endpoint(*args, **kwargs)
+        ident = threading.get_ident()
+        profiler.track_thread(ident)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.untrack_thread(ident)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class that tracks the worker thread running a profiled sync endpoint"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _track_profiled_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+if PROFILING_ENABLED:
+    # Must be set before the routes below are declared
+    app.router.route_class = ProfiledRoute
+
+
+# Bootstrap mode serves index.html with the activities already inlined, so the
+# first render does not wait for app.js to fetch /activities. The data and a
+# preload hint are inserted at fixed anchors, checked here so that an edit to
+# index.html cannot silently break the page.
+BOOTSTRAP_MODE = os.environ.get("BOOTSTRAP_MODE", "").lower() in ("1", "true", "yes")
+_APP_SCRIPT = '<script src="/static/app.js"></script>'
+_INDEX_HTML = (current_dir / "static" / "index.html").read_text()
+for _anchor in (_APP_SCRIPT, "</head>", 'href="/static/styles.css"'):
+    if _INDEX_HTML.count(_anchor) != 1:
+        raise RuntimeError(f"index.html must contain {_anchor} exactly once")
+_BOOTSTRAP_HEAD, _BOOTSTRAP_TAIL = (
+    _INDEX_HTML
+    .replace("</head>", '  <link rel="preload" href="/static/app.js" as="script" />\n  </head>')
+    .encode("utf-8")
+    .split(_APP_SCRIPT.encode("utf-8"))
+)
+_BOOTSTRAP_HEAD += b'<script id="initial-activities" type="application/json">'
+_BOOTSTRAP_TAIL = b"</script>\n    " + _APP_SCRIPT.encode("utf-8") + _BOOTSTRAP_TAIL
+_PRELOAD_LINKS = "</static/styles.css>; rel=preload; as=style, </static/app.js>; rel=preload; as=script"
+
+
+def render_bootstrap_page():
+    """Render index.html with the current activities embedded as JSON"""
+    # Escaping "<" keeps the JSON from closing the script element early
+    data = encoded_response("activities", lambda: activities).replace(b"<", b"\\u003c")
+    return _BOOTSTRAP_HEAD + data + _BOOTSTRAP_TAIL
+
 
 @app.get("/")
 def root():
+    if BOOTSTRAP_MODE:
+        return bootstrap()
     return RedirectResponse(url="/static/index.html")
 
 
+@app.get("/bootstrap")
+def bootstrap():
+    """Serve the page with the initial activities inlined"""
+    body = cached_response("bootstrap", render_bootstrap_page)
+    return Response(content=body, media_type="text/html", headers={"Link": _PRELOAD_LINKS})
+
+
 @app.get("/activities")
 def get_activities():
-    return activities
+    body = encoded_response("activities", lambda: activities)
+    return Response(content=body, media_type="application/json")
+
+
+def build_stats(top: int):
+    """Assemble the statistics payload from the incremental counters"""
+    with _stats_lock:
+        counts = dict(activity_counts.counts)
+        total = activity_counts.total
+        popular = activity_counts.top(top)
+        active = student_counts.top(top)
+
+    per_activity = {}
+    for name, activity in activities.items():
+        enrolled = counts.get(name, 0)
+        per_activity[name] = {
+            "participants": enrolled,
+            "max_participants": activity["max_participants"],
+            "fill_rate": enrolled / activity["max_participants"],
+        }
+
+    return {
+        "total_enrollments": total,
+        "activities": per_activity,
+        "most_popular_activities": [
+            {"activity": name, "participants": count}
+            for name, count in popular
+        ],
+        "most_active_students": [
+            {"email": email, "activities": count}
+            for email, count in active
+        ],
+    }
+
+
+@app.get("/stats")
+def get_stats(top: int = 5):
+    """Enrollment statistics for dashboards"""
+    if not 1 <= top <= 100:
+        raise HTTPException(status_code=400, detail="Top must be between 1 and 100")
+
+    body = encoded_response(f"stats:{top}", lambda: build_stats(top))
+    return Response(content=body, media_type="application/json")
 
 
 @app.post("/activities/{activity_name}/signup")
@@ -95,6 +615,12 @@ def signup_for_activity(activity_name: str, email: str):
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
 
+    # Validate and normalize the email so case and whitespace variants match
+    normalized_email = normalize_email(email)
+    if normalized_email is None:
+        raise HTTPException(status_code=422, detail="Invalid email address")
+    email = normalized_email
+
     # Get the specific activity
     activity = activities[activity_name]
     # Validate student is not already signed up
@@ -102,6 +628,12 @@ def signup_for_activity(activity_name: str, email: str):
         raise HTTPException(status_code=400, detail="Student already signed up for this activity")  
     # Add student
     activity["participants"].append(email)
+    # The data has changed, so invalidate cached reads even if bookkeeping fails
+    try:
+        count_signup(activity_name, email)
+        record_event(activity_name, "signup", email)
+    finally:
+        mark_changed()
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
@@ -112,6 +644,12 @@ def remove_participant(activity_name: str, email: str):
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
 
+    # Validate and normalize the email so case and whitespace variants match
+    normalized_email = normalize_email(email)
+    if normalized_email is None:
+        raise HTTPException(status_code=422, detail="Invalid email address")
+    email = normalized_email
+
     # Get the specific activity
     activity = activities[activity_name]
     
@@ -121,4 +659,82 @@ def remove_participant(activity_name: str, email: str):
     
     # Remove participant
     activity["participants"].remove(email)
+    # The data has changed, so invalidate cached reads even if bookkeeping fails
+    try:
+        count_removal(activity_name, email)
+        record_event(activity_name, "remove", email)
+    finally:
+        mark_changed()
     return {"message": f"Removed {email} from {activity_name}"}
+
+
+@app.get("/activities/{activity_name}/history")
+def get_activity_history(activity_name: str, since: Optional[datetime] = None,
+                         after: int = 0, limit: int = 50):
+    """Page through the enrollment changes of an activity, oldest first"""
+    # Validate activity exists
+    if activity_name not in activities:
+        raise HTTPException(status_code=404, detail="Activity not found")
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="Limit must be between 1 and 500")
+
+    with _history_lock:
+        events = activity_history.get(activity_name, [])
+        times = _history_times.get(activity_name, [])
+
+        # Both the timestamps and the ids are sorted, so bisect for the start
+        start = 0
+        since_time = 0
+        if since is not None:
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            since_time = (since - _EPOCH) // timedelta(microseconds=1)
+            start = bisect_left(times, since_time)
+        if after:
+            start = max(start, bisect_right(events, after, key=lambda event: event["id"]))
+        page = events[start:start + limit]
+        has_more = start + limit < len(events)
+
+        # Events matching the query were dropped if the newest evicted one matches it
+        evicted_id, evicted_time = _history_evicted.get(activity_name, (0, 0))
+        truncated = evicted_id > after and evicted_time >= since_time
+
+    return {
+        "activity": activity_name,
+        "events": page,
+        "next_after": page[-1]["id"] if has_more else None,
+        "truncated": truncated,
+    }
+
+
+profile_router = APIRouter(prefix="/admin/profile")
+
+
+@profile_router.get("")
+def get_profile(top: int = 20):
+    """Summary of the functions seen most often in profiled requests"""
+    return {
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "interval": profiler.interval,
+        "profiled_requests": profiler.requests,
+        "samples": profiler.samples,
+        "top_functions": profiler.top_functions(top),
+    }
+
+
+@profile_router.get("/collapsed", response_class=PlainTextResponse)
+def get_profile_collapsed():
+    """Aggregated stacks of profiled requests, ready for a flamegraph"""
+    return profiler.collapsed()
+
+
+@profile_router.delete("")
+def reset_profile():
+    """Discard the collected profile"""
+    profiler.reset()
+    return {"message": "Profile reset"}
+
+
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(profile_router)
@@ -10,72 +10,77 @@ document.addEventListener("DOMContentLoaded", () => {
       const response = await fetch("/activities");
       const activities = await response.json();
 
-      // Clear loading message
-      activitiesList.innerHTML = "";
-      
-      // Clear and reset dropdown options
-      activitySelect.innerHTML = '<option value="">-- Select an activity --</option>';
-
-      // Populate activities list
-      Object.entries(activities).forEach(([name, details]) => {
-        const activityCard = document.createElement("div");
-        activityCard.className = "activity-card";
-
-        const spotsLeft = details.max_participants - details.participants.length;
-
-        // Create participants list HTML
-        let participantsHtml = '';
-        if (details.participants.length > 0) {
-          const participantItems = details.participants
-            .map(email => `
-              <li>
-                <span class="participant-email">${email}</span>
-                <span class="delete-icon" data-activity="${name}" data-email="${email}" title="Remove participant">×</span>
-              </li>
-            `)
-            .join('');
-          participantsHtml = `
-            <div class="activity-participants">
-              <h5>Participants</h5>
-              <ul class="participants-list">
-                ${participantItems}
-              </ul>
-            </div>
-          `;
-        } else {
-          participantsHtml = `
-            <div class="activity-participants">
-              <h5>Participants</h5>
-              <p class="participants-empty">No participants yet</p>
-            </div>
-          `;
-        }
-
-        activityCard.innerHTML = `
-          <h4>${name}</h4>
-          <p>${details.description}</p>
-          <p><strong>Schedule:</strong> ${details.schedule}</p>
-          <p><strong>Availability:</strong> ${spotsLeft} spots left</p>
-          ${participantsHtml}
-        `;
-
-        activitiesList.appendChild(activityCard);
-
-        // Add option to select dropdown
-        const option = document.createElement("option");
-        option.value = name;
-        option.textContent = name;
-        activitySelect.appendChild(option);
-      });
-
-      // Add event listeners for delete icons
-      addDeleteEventListeners();
+      renderActivities(activities);
     } catch (error) {
       activitiesList.innerHTML = "<p>Failed to load activities. Please try again later.</p>";
       console.error("Error fetching activities:", error);
     }
   }
 
+  // Function to render activities into the list and dropdown
+  function renderActivities(activities) {
+    // Clear loading message
+    activitiesList.innerHTML = "";
+    
+    // Clear and reset dropdown options
+    activitySelect.innerHTML = '<option value="">-- Select an activity --</option>';
+
+    // Populate activities list
+    Object.entries(activities).forEach(([name, details]) => {
+      const activityCard = document.createElement("div");
+      activityCard.className = "activity-card";
+
+      const spotsLeft = details.max_participants - details.participants.length;
+
+      // Create participants list HTML
+      let participantsHtml = '';
+      if (details.participants.length > 0) {
+        const participantItems = details.participants
+          .map(email => `
+            <li>
+              <span class="participant-email">${email}</span>
+              <span class="delete-icon" data-activity="${name}" data-email="${email}" title="Remove participant">×</span>
+            </li>
+          `)
+          .join('');
+        participantsHtml = `
+          <div class="activity-participants">
+            <h5>Participants</h5>
+            <ul class="participants-list">
+              ${participantItems}
+            </ul>
+          </div>
+        `;
+      } else {
+        participantsHtml = `
+          <div class="activity-participants">
+            <h5>Participants</h5>
+            <p class="participants-empty">No participants yet</p>
+          </div>
+        `;
+      }
+
+      activityCard.innerHTML = `
+        <h4>${name}</h4>
+        <p>${details.description}</p>
+        <p><strong>Schedule:</strong> ${details.schedule}</p>
+        <p><strong>Availability:</strong> ${spotsLeft} spots left</p>
+        ${participantsHtml}
+      `;
+
+      activitiesList.appendChild(activityCard);
+
+      // Add option to select dropdown
+      const option = document.createElement("option");
+      option.value = name;
+      option.textContent = name;
+      activitySelect.appendChild(option);
+    });
+
+    // Add event listeners for delete icons
+    addDeleteEventListeners();
+  }
+
   // Function to add event listeners to delete icons
   function addDeleteEventListeners() {
     const deleteIcons = document.querySelectorAll('.delete-icon');
@@ -169,6 +174,11 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   });
 
-  // Initialize app
-  fetchActivities();
+  // Initialize app, using the activities inlined by the bootstrap page if present
+  const initialActivities = document.getElementById("initial-activities");
+  if (initialActivities) {
+    renderActivities(JSON.parse(initialActivities.textContent));
+  } else {
+    fetchActivities();
+  }
 });
@@ -0,0 +1,101 @@
+"""
+Tests for the bootstrap page of the High School Activities API
+"""
+
+import json
+import re
+from pathlib import Path
+
+from fastapi import status
+from urllib.parse import quote
+
+import app as app_module
+from app import activities, mark_changed
+
+INITIAL_ACTIVITIES = re.compile(
+    r'<script id="initial-activities" type="application/json">(.*?)</script>', re.S
+)
+
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+def inlined_activities(html):
+    """Extract the activities embedded in the bootstrap page"""
+    match = INITIAL_ACTIVITIES.search(html)
+    assert match is not None
+    return json.loads(match.group(1))
+
+
+class TestBootstrapEndpoint:
+    """Test cases for the GET /bootstrap endpoint"""
+
+    def test_bootstrap_serves_html(self, client, reset_activities):
+        """Test that the bootstrap page is the app's HTML with absolute asset paths"""
+        response = client.get("/bootstrap")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/html")
+        assert 'href="/static/styles.css"' in response.text
+        assert '<script src="/static/app.js"></script>' in response.text
+
+    def test_bootstrap_inlines_activities(self, client, reset_activities):
+        """Test that the inlined data matches the /activities endpoint"""
+        response = client.get("/bootstrap")
+
+        assert inlined_activities(response.text) == client.get("/activities").json()
+
+    def test_bootstrap_preload_hints(self, client, reset_activities):
+        """Test that static assets are announced for preloading"""
+        response = client.get("/bootstrap")
+
+        link = response.headers["link"]
+        assert "</static/styles.css>; rel=preload; as=style" in link
+        assert "</static/app.js>; rel=preload; as=script" in link
+
+    def test_bootstrap_reflects_changes(self, client, reset_activities, sample_email, sample_activity_name):
+        """Test that a signup invalidates the cached page"""
+        client.get("/bootstrap")
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": sample_email}
+        )
+
+        data = inlined_activities(client.get("/bootstrap").text)
+        assert sample_email in data[sample_activity_name]["participants"]
+
+    def test_bootstrap_escapes_markup(self, client, reset_activities):
+        """Test that data containing markup cannot close the script element"""
+        activities["Chess Club"]["description"] = "</script><script>alert(1)</script>"
+        mark_changed()
+
+        response = client.get("/bootstrap")
+
+        assert response.text.count("</script>") == 2  # Inlined data and app.js
+        assert inlined_activities(response.text)["Chess Club"]["description"].startswith("</script>")
+
+    def test_root_serves_bootstrap_in_bootstrap_mode(self, client, reset_activities, monkeypatch):
+        """Test that the root serves the bootstrap page when bootstrap mode is on"""
+        monkeypatch.setattr(app_module, "BOOTSTRAP_MODE", True)
+
+        response = client.get("/", follow_redirects=False)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert INITIAL_ACTIVITIES.search(response.text)
+
+    def test_bootstrap_page_is_index_plus_inserts(self, client, reset_activities):
+        """Test that the bootstrap page is index.html with only the data and preload hint added"""
+        html = client.get("/bootstrap").text
+        index_html = (SRC_DIR / "static" / "index.html").read_text()
+
+        stripped = INITIAL_ACTIVITIES.sub("", html).replace(
+            '    <link rel="preload" href="/static/app.js" as="script" />\n', ""
+        ).replace('\n    <script src="/static/app.js">', '<script src="/static/app.js">')
+        assert stripped == index_html
+
+    def test_bootstrap_data_inside_script(self, client, reset_activities):
+        """Test that the inlined data sits before app.js and inside the document"""
+        html = client.get("/bootstrap").text
+
+        assert html.rstrip().endswith("</html>")
+        assert html.index('id="initial-activities"') < html.index('src="/static/app.js"')
@@ -0,0 +1,152 @@
+"""
+Tests for coalescing and caching of read responses in the High School Activities API
+"""
+
+import threading
+
+import pytest
+from fastapi import status
+from urllib.parse import quote
+
+import app as app_module
+from app import SingleFlight, encoded_response, mark_changed
+
+
+class TestSingleFlight:
+    """Test cases for sharing one in-flight computation between callers"""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that callers arriving while a computation runs reuse its result"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return b"shared"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("key", compute)))
+        leader.start()
+        started.wait(timeout=5)
+
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("key", compute)))
+            for _ in range(5)
+        ]
+        for follower in followers:
+            follower.start()
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=5)
+
+        assert results == [b"shared"] * 6
+        assert len(calls) == 1
+
+    def test_sequential_callers_recompute(self):
+        """Test that a finished computation is not reused for later calls"""
+        flight = SingleFlight()
+        calls = []
+
+        flight.do("key", lambda: calls.append(1))
+        flight.do("key", lambda: calls.append(1))
+
+        assert len(calls) == 2
+
+    def test_error_propagates_and_clears(self):
+        """Test that a failing computation raises and does not block later calls"""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        assert flight.do("key", lambda: "ok") == "ok"
+
+
+class TestEncodedResponses:
+    """Test cases for per-version caching of encoded read responses"""
+
+    def test_encodes_once_per_version(self, reset_activities):
+        """Test that repeated reads of the same version reuse the bytes"""
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"version": app_module.state_version}
+
+        first = encoded_response("test", build)
+        second = encoded_response("test", build)
+        assert first is second
+        assert len(calls) == 1
+
+        mark_changed()
+        third = encoded_response("test", build)
+        assert third != first
+        assert len(calls) == 2
+
+    def test_activities_reflect_changes(self, client, reset_activities, sample_email, sample_activity_name):
+        """Test that a signup invalidates the cached /activities response"""
+        before = client.get("/activities")
+        assert before.status_code == status.HTTP_200_OK
+        assert before.headers["content-type"] == "application/json"
+
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": sample_email}
+        )
+
+        after = client.get("/activities").json()
+        assert sample_email in after[sample_activity_name]["participants"]
+
+    def test_failed_bookkeeping_still_invalidates(self, client, reset_activities,
+                                                  sample_email, sample_activity_name, monkeypatch):
+        """Test that a signup invalidates cached reads even if recording it fails"""
+        client.get("/activities")
+
+        def fail(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(app_module, "record_event", fail)
+        with pytest.raises(RuntimeError):
+            client.post(
+                f"/activities/{quote(sample_activity_name)}/signup",
+                params={"email": sample_email}
+            )
+        monkeypatch.undo()
+
+        data = client.get("/activities").json()
+        assert sample_email in data[sample_activity_name]["participants"]
+
+    def test_slow_render_keeps_newer_entry(self, reset_activities):
+        """Test that a render for an old version does not replace a newer cached entry"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_build():
+            calls.append("old")
+            started.set()
+            release.wait(timeout=5)
+            return {"render": "old"}
+
+        def build():
+            calls.append("new")
+            return {"render": "new"}
+
+        slow_reader = threading.Thread(target=lambda: encoded_response("race", slow_build))
+        slow_reader.start()
+        started.wait(timeout=5)
+
+        mark_changed()
+        newer = encoded_response("race", build)
+        release.set()
+        slow_reader.join(timeout=5)
+
+        assert encoded_response("race", build) is newer
+        assert calls == ["old", "new"]
+        assert app_module._encoded_responses["race"][0] == app_module.state_version
@@ -0,0 +1,232 @@
+"""
+Tests for the activity history endpoint of the High School Activities API
+"""
+
+from types import SimpleNamespace
+
+from fastapi import status
+from urllib.parse import quote
+
+import app as app_module
+
+
+class TestHistoryEndpoint:
+    """Test cases for the GET /activities/{activity_name}/history endpoint"""
+
+    def test_history_empty_initially(self, client, reset_activities, sample_activity_name):
+        """Test that an untouched activity has no history"""
+        response = client.get(f"/activities/{quote(sample_activity_name)}/history")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["activity"] == sample_activity_name
+        assert data["events"] == []
+        assert data["next_after"] is None
+        assert data["truncated"] is False
+
+    def test_history_records_signup_and_removal(self, client, reset_activities,
+                                                sample_email, sample_activity_name):
+        """Test that signups and removals are recorded in order"""
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": sample_email}
+        )
+        client.delete(
+            f"/activities/{quote(sample_activity_name)}/participants/{quote(sample_email)}"
+        )
+
+        response = client.get(f"/activities/{quote(sample_activity_name)}/history")
+        events = response.json()["events"]
+
+        assert [event["action"] for event in events] == ["signup", "remove"]
+        assert all(event["email"] == sample_email for event in events)
+        assert events[0]["id"] < events[1]["id"]
+        assert events[0]["timestamp"] <= events[1]["timestamp"]
+
+    def test_history_ignores_failed_requests(self, client, reset_activities, sample_activity_name):
+        """Test that rejected signups are not recorded"""
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": "michael@mergington.edu"}  # Already in Chess Club
+        )
+
+        response = client.get(f"/activities/{quote(sample_activity_name)}/history")
+        assert response.json()["events"] == []
+
+    def test_history_is_per_activity(self, client, reset_activities, sample_email):
+        """Test that each activity only reports its own changes"""
+        client.post(f"/activities/{quote('Art Club')}/signup", params={"email": sample_email})
+
+        response = client.get(f"/activities/{quote('Chess Club')}/history")
+        assert response.json()["events"] == []
+
+        response = client.get(f"/activities/{quote('Art Club')}/history")
+        assert len(response.json()["events"]) == 1
+
+    def test_history_pagination(self, client, reset_activities, sample_activity_name):
+        """Test paging through the history with the next_after cursor"""
+        emails = [f"page{i}@mergington.edu" for i in range(5)]
+        for email in emails:
+            client.post(
+                f"/activities/{quote(sample_activity_name)}/signup",
+                params={"email": email}
+            )
+
+        seen = []
+        after = 0
+        while True:
+            response = client.get(
+                f"/activities/{quote(sample_activity_name)}/history",
+                params={"after": after, "limit": 2}
+            )
+            data = response.json()
+            seen.extend(event["email"] for event in data["events"])
+            if data["next_after"] is None:
+                break
+            after = data["next_after"]
+
+        assert seen == emails
+
+    def test_history_since_filter(self, client, reset_activities, sample_activity_name):
+        """Test filtering the history by timestamp"""
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": "early@mergington.edu"}
+        )
+        response = client.get(f"/activities/{quote(sample_activity_name)}/history")
+        first_timestamp = response.json()["events"][0]["timestamp"]
+
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"since": first_timestamp}
+        )
+        assert len(response.json()["events"]) == 1
+
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"since": "2999-01-01T00:00:00Z"}
+        )
+        assert response.json()["events"] == []
+
+    def test_history_nonexistent_activity(self, client, reset_activities):
+        """Test requesting the history of a non-existent activity"""
+        response = client.get(f"/activities/{quote('Nonexistent Activity')}/history")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "Activity not found" in response.json()["detail"]
+
+    def test_history_invalid_limit(self, client, reset_activities, sample_activity_name):
+        """Test that out-of-range page sizes are rejected"""
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"limit": 0}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_history_since_includes_boundary_event(self, client, reset_activities,
+                                                   sample_activity_name, monkeypatch):
+        """Test that since set to an event's own timestamp includes that event"""
+        # A clock reading that does not fall on a whole microsecond
+        now_ns = 1_700_000_000_123_456_789
+        monkeypatch.setattr(app_module, "time", SimpleNamespace(
+            time=lambda: now_ns / 1e9, time_ns=lambda: now_ns
+        ))
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": "boundary@mergington.edu"}
+        )
+        monkeypatch.undo()
+
+        response = client.get(f"/activities/{quote(sample_activity_name)}/history")
+        timestamp = response.json()["events"][0]["timestamp"]
+
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"since": timestamp}
+        )
+        assert [event["email"] for event in response.json()["events"]] == ["boundary@mergington.edu"]
+
+    def test_history_since_and_after_combined(self, client, reset_activities, sample_activity_name):
+        """Test that since and after together start at the later of the two"""
+        for i in range(4):
+            client.post(
+                f"/activities/{quote(sample_activity_name)}/signup",
+                params={"email": f"combined{i}@mergington.edu"}
+            )
+        events = client.get(f"/activities/{quote(sample_activity_name)}/history").json()["events"]
+
+        # The cursor is further along than the timestamp
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"since": events[1]["timestamp"], "after": events[2]["id"]}
+        )
+        assert [event["id"] for event in response.json()["events"]] == [events[3]["id"]]
+
+        # The timestamp is further along than the cursor
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"since": events[2]["timestamp"], "after": events[0]["id"]}
+        )
+        assert [event["id"] for event in response.json()["events"]][0] == events[2]["id"]
+
+
+class TestHistoryEviction:
+    """Test cases for dropping the oldest history segments"""
+
+    @staticmethod
+    def fill_history(client, activity_name, count):
+        for i in range(count):
+            client.post(
+                f"/activities/{quote(activity_name)}/signup",
+                params={"email": f"evict{i}@mergington.edu"}
+            )
+
+    def test_oldest_segment_is_evicted(self, client, reset_activities, sample_activity_name, monkeypatch):
+        """Test that exceeding the limit drops one whole segment from events and index"""
+        monkeypatch.setattr(app_module, "HISTORY_LIMIT_PER_ACTIVITY", 4)
+        monkeypatch.setattr(app_module, "HISTORY_SEGMENT_SIZE", 2)
+
+        self.fill_history(client, sample_activity_name, 7)
+
+        events = app_module.activity_history[sample_activity_name]
+        times = app_module._history_times[sample_activity_name]
+        assert [event["email"] for event in events] == [f"evict{i}@mergington.edu" for i in range(2, 7)]
+        assert len(times) == len(events)
+        assert times == sorted(times)
+
+        response = client.get(f"/activities/{quote(sample_activity_name)}/history")
+        data = response.json()
+        assert len(data["events"]) == 5
+        assert data["truncated"] is True
+
+    def test_cursor_into_evicted_events(self, client, reset_activities, sample_activity_name, monkeypatch):
+        """Test that a cursor pointing at evicted events is reported as truncated"""
+        monkeypatch.setattr(app_module, "HISTORY_LIMIT_PER_ACTIVITY", 4)
+        monkeypatch.setattr(app_module, "HISTORY_SEGMENT_SIZE", 2)
+
+        self.fill_history(client, sample_activity_name, 1)
+        first_id = client.get(
+            f"/activities/{quote(sample_activity_name)}/history"
+        ).json()["events"][0]["id"]
+        for i in range(1, 7):
+            client.post(
+                f"/activities/{quote(sample_activity_name)}/signup",
+                params={"email": f"later{i}@mergington.edu"}
+            )
+
+        # The event right after the cursor was evicted
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"after": first_id}
+        )
+        data = response.json()
+        assert data["truncated"] is True
+        assert data["events"][0]["email"] == "later2@mergington.edu"
+
+        # A cursor past the evicted segment sees a complete page
+        response = client.get(
+            f"/activities/{quote(sample_activity_name)}/history",
+            params={"after": data["events"][0]["id"]}
+        )
+        assert response.json()["truncated"] is False
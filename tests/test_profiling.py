@@ -0,0 +1,229 @@
+"""
+Tests for the profiling mode of the High School Activities API
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+import app as app_module
+from app import ProfiledRoute, ProfilingMiddleware, StackSampler
+
+
+def busy_for(seconds):
+    """Keep the current thread busy without releasing it to an idle wait"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def profiled_work():
+    busy_for(0.1)
+    return {}
+
+
+def unprofiled_work():
+    busy_for(0.1)
+    return {}
+
+
+@pytest.fixture
+def reset_profile():
+    """Start each profiling test with an empty profile"""
+    app_module.profiler.reset()
+    yield
+    app_module.profiler.reset()
+
+
+@pytest.fixture
+def profiling_client(reset_profile, monkeypatch):
+    """Create a test client for an app with profiling installed and the header allowed"""
+    monkeypatch.setattr(app_module, "PROFILE_ALLOW_HEADER", True)
+    profiled_app = FastAPI()
+    profiled_app.router.route_class = ProfiledRoute
+    profiled_app.add_middleware(ProfilingMiddleware)
+    profiled_app.include_router(app_module.profile_router)
+    profiled_app.add_api_route("/activities", app_module.get_activities)
+    profiled_app.add_api_route("/profiled-work", profiled_work)
+    profiled_app.add_api_route("/unprofiled-work", unprofiled_work)
+    return TestClient(profiled_app)
+
+
+class TestProfilingDisabled:
+    """Test cases for the app when profiling is not configured"""
+
+    def test_admin_routes_not_mounted(self, client):
+        """Test that the profile endpoints do not exist by default"""
+        assert client.get("/admin/profile").status_code == status.HTTP_404_NOT_FOUND
+        assert client.get("/admin/profile/collapsed").status_code == status.HTTP_404_NOT_FOUND
+        assert client.delete("/admin/profile").status_code in (
+            status.HTTP_404_NOT_FOUND, status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+
+    def test_header_ignored_without_opt_in(self, client, reset_profile):
+        """Test that the X-Profile header does nothing unless allowed"""
+        client.get("/activities", headers={"X-Profile": "1"})
+
+        assert app_module.profiler.requests == 0
+
+    def test_header_ignored_by_middleware_without_opt_in(self, reset_profile):
+        """Test that an installed middleware still needs PROFILE_ALLOW_HEADER for the header"""
+        scope = {"type": "http", "path": "/activities", "headers": [(b"x-profile", b"1")]}
+
+        assert ProfilingMiddleware._should_profile(scope) is False
+
+
+class TestProfilingMiddleware:
+    """Test cases for selecting which requests are profiled"""
+
+    def test_requests_not_profiled_by_default(self, profiling_client):
+        """Test that requests without the header are not profiled"""
+        profiling_client.get("/activities")
+
+        assert profiling_client.get("/admin/profile").json()["profiled_requests"] == 0
+
+    def test_profile_header(self, profiling_client):
+        """Test that the X-Profile header profiles a single request"""
+        response = profiling_client.get("/activities", headers={"X-Profile": "1"})
+        assert response.status_code == status.HTTP_200_OK
+
+        assert profiling_client.get("/admin/profile").json()["profiled_requests"] == 1
+
+    def test_sample_rate(self, profiling_client, monkeypatch):
+        """Test that a sample rate of 1 profiles every request"""
+        monkeypatch.setattr(app_module, "PROFILE_SAMPLE_RATE", 1.0)
+        for _ in range(3):
+            profiling_client.get("/activities")
+
+        data = profiling_client.get("/admin/profile").json()
+        assert data["profiled_requests"] == 3
+        assert data["sample_rate"] == 1.0
+
+    def test_samples_only_profiled_requests(self, profiling_client):
+        """Test that a concurrent unprofiled request does not show up in the profile"""
+        other = threading.Thread(target=lambda: profiling_client.get("/unprofiled-work"))
+        other.start()
+        profiling_client.get("/profiled-work", headers={"X-Profile": "1"})
+        other.join()
+
+        collapsed = profiling_client.get("/admin/profile/collapsed").text
+        assert "profiled_work" in collapsed
+        assert "unprofiled_work" not in collapsed
+
+
+class TestProfileEndpoints:
+    """Test cases for the /admin/profile endpoints"""
+
+    def test_profile_summary_structure(self, profiling_client):
+        """Test the shape of the profile summary"""
+        data = profiling_client.get("/admin/profile").json()
+
+        assert set(data) == {"sample_rate", "interval", "profiled_requests", "samples", "top_functions"}
+        assert data["top_functions"] == []
+
+    def test_collapsed_is_plain_text(self, profiling_client):
+        """Test that collapsed stacks are served as text"""
+        response = profiling_client.get("/admin/profile/collapsed")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def test_reset_profile(self, profiling_client):
+        """Test discarding the collected profile"""
+        profiling_client.get("/activities", headers={"X-Profile": "1"})
+
+        response = profiling_client.delete("/admin/profile")
+        assert response.status_code == status.HTTP_200_OK
+        assert profiling_client.get("/admin/profile").json()["profiled_requests"] == 0
+
+
+class TestStackSampler:
+    """Test cases for aggregating sampled stacks"""
+
+    def test_samples_busy_thread(self):
+        """Test that a busy tracked thread shows up in the collapsed stacks and summary"""
+        sampler = StackSampler(interval=0.001)
+        stop = threading.Event()
+
+        def busy_loop():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_loop)
+        worker.start()
+        sampler.track_thread(worker.ident)
+        time.sleep(0.05)
+        sampler.untrack_thread(worker.ident)
+        stop.set()
+        worker.join()
+
+        assert sampler.samples > 0
+        assert "busy_loop" in sampler.collapsed()
+        assert any("busy_loop" in entry["function"] for entry in sampler.top_functions(10))
+
+    def test_untracked_thread_not_sampled(self):
+        """Test that threads not serving a profiled request are ignored"""
+        sampler = StackSampler(interval=0.001)
+        stop = threading.Event()
+
+        def untracked_loop():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=untracked_loop)
+        worker.start()
+        sampler.sample()
+        stop.set()
+        worker.join()
+
+        assert sampler.samples == 0
+
+    def test_collapsed_format(self):
+        """Test that each collapsed line is a stack followed by its count"""
+        sampler = StackSampler(interval=0.001)
+        sampler.track_thread(threading.get_ident())
+        sampler.sample()
+        sampler.untrack_thread(threading.get_ident())
+
+        assert sampler.samples >= 1
+        for line in sampler.collapsed().splitlines():
+            stack, _, count = line.rpartition(" ")
+            assert stack
+            assert int(count) > 0
+
+
+class TestProfilingSettings:
+    """Test cases for validating the profiling environment variables at import"""
+
+    @staticmethod
+    def import_app(**env):
+        src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+        return subprocess.run(
+            [sys.executable, "-c", "import app"],
+            cwd=src_dir, env={**os.environ, **env}, capture_output=True, text=True,
+        )
+
+    @pytest.mark.parametrize("env, message", [
+        ({"PROFILE_SAMPLE_RATE": "abc"}, "PROFILE_SAMPLE_RATE must be a number"),
+        ({"PROFILE_SAMPLE_RATE": "1.5"}, "PROFILE_SAMPLE_RATE must be between 0 and 1"),
+        ({"PROFILE_INTERVAL": "0"}, "PROFILE_INTERVAL must be greater than 0"),
+        ({"PROFILE_INTERVAL": "-1"}, "PROFILE_INTERVAL must be greater than 0"),
+    ])
+    def test_invalid_settings_rejected(self, env, message):
+        """Test that invalid profiling settings stop the app with a clear error"""
+        result = self.import_app(**env)
+
+        assert result.returncode != 0
+        assert f"RuntimeError: {message}" in result.stderr
+
+    def test_valid_settings_accepted(self):
+        """Test that valid profiling settings import cleanly"""
+        result = self.import_app(PROFILE_SAMPLE_RATE="0.5", PROFILE_INTERVAL="0.01")
+
+        assert result.returncode == 0, result.stderr
@@ -133,4 +133,65 @@ class TestSignupEndpoint:
         for email in emails:
             assert email in participants
         
-        assert len(participants) == initial_count + len(emails)
\ No newline at end of file
+        assert len(participants) == initial_count + len(emails)
+
+
+class TestEmailNormalization:
+    """Test cases for email validation and normalization on signup and removal"""
+
+    def test_signup_normalizes_case_and_whitespace(self, client, reset_activities, sample_activity_name):
+        """Test that signup stores the canonical form of the email"""
+        response = client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": "  New.Student@Mergington.EDU "}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "new.student@mergington.edu" in response.json()["message"]
+
+        participants = client.get("/activities").json()[sample_activity_name]["participants"]
+        assert "new.student@mergington.edu" in participants
+
+    def test_signup_duplicate_with_different_case(self, client, reset_activities, sample_activity_name):
+        """Test that case variants of an existing participant are rejected"""
+        response = client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": "Michael@Mergington.edu "}  # Already in Chess Club
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_remove_with_different_case(self, client, reset_activities, sample_activity_name):
+        """Test that removal matches participants regardless of case"""
+        response = client.delete(
+            f"/activities/{quote(sample_activity_name)}/participants/{quote('MICHAEL@mergington.edu')}"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        participants = client.get("/activities").json()[sample_activity_name]["participants"]
+        assert "michael@mergington.edu" not in participants
+
+    @pytest.mark.parametrize("email", [
+        "not-an-email",
+        "student@gmail.com",
+        "student@mergington.edu.evil.com",
+        "@mergington.edu",
+        "two..dots@mergington.edu",
+    ])
+    def test_signup_invalid_email(self, client, reset_activities, sample_activity_name, email):
+        """Test that malformed or foreign addresses are rejected"""
+        response = client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": email}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "Invalid email" in response.json()["detail"]
+
+    def test_remove_invalid_email(self, client, reset_activities, sample_activity_name):
+        """Test that removal rejects malformed addresses"""
+        response = client.delete(
+            f"/activities/{quote(sample_activity_name)}/participants/not-an-email"
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,45 @@
+"""
+Tests for snapshotting and restoring the state of the High School Activities API
+"""
+
+from urllib.parse import quote
+
+from app import activities, restore_state, snapshot_state
+
+
+class TestStateSnapshot:
+    """Test cases for snapshot_state and restore_state"""
+
+    def test_snapshot_is_independent_copy(self, reset_activities):
+        """Test that later changes do not leak into a snapshot"""
+        snapshot = snapshot_state()
+        activities["Chess Club"]["participants"].append("late@mergington.edu")
+
+        assert "late@mergington.edu" not in snapshot["Chess Club"]["participants"]
+
+    def test_restore_resets_activities_and_derived_state(self, client, reset_activities,
+                                                         sample_email, sample_activity_name):
+        """Test that restoring undoes signups along with their history and statistics"""
+        snapshot = snapshot_state()
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": sample_email}
+        )
+
+        restore_state(snapshot)
+
+        data = client.get("/activities").json()
+        assert sample_email not in data[sample_activity_name]["participants"]
+        assert client.get("/stats").json()["total_enrollments"] == 18
+        history = client.get(f"/activities/{quote(sample_activity_name)}/history").json()
+        assert history["events"] == []
+
+    def test_snapshot_can_be_restored_repeatedly(self, reset_activities):
+        """Test that restoring does not hand the snapshot's lists to the app"""
+        snapshot = snapshot_state()
+
+        restore_state(snapshot)
+        activities["Chess Club"]["participants"].append("late@mergington.edu")
+        restore_state(snapshot)
+
+        assert "late@mergington.edu" not in activities["Chess Club"]["participants"]
@@ -0,0 +1,132 @@
+"""
+Tests for the statistics endpoint of the High School Activities API
+"""
+
+import threading
+
+import pytest
+from fastapi import status
+from urllib.parse import quote
+
+import app as app_module
+from app import Leaderboard
+
+
+class TestStatsEndpoint:
+    """Test cases for the GET /stats endpoint"""
+
+    def test_stats_initial_state(self, client, reset_activities):
+        """Test the statistics of the default activities"""
+        response = client.get("/stats")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total_enrollments"] == 18  # 9 activities with 2 participants each
+        assert len(data["activities"]) == 9
+
+        chess_club = data["activities"]["Chess Club"]
+        assert chess_club["participants"] == 2
+        assert chess_club["max_participants"] == 12
+        assert chess_club["fill_rate"] == pytest.approx(2 / 12)
+
+    def test_stats_follow_signup_and_removal(self, client, reset_activities):
+        """Test that the statistics are updated by signups and removals"""
+        email = "busy@mergington.edu"
+        for activity in ["Chess Club", "Art Club", "Drama Club"]:
+            client.post(f"/activities/{quote(activity)}/signup", params={"email": email})
+        client.post(f"/activities/{quote('Chess Club')}/signup", params={"email": "other@mergington.edu"})
+
+        data = client.get("/stats").json()
+        assert data["total_enrollments"] == 22
+        assert data["most_popular_activities"][0] == {"activity": "Chess Club", "participants": 4}
+        assert data["most_active_students"][0] == {"email": email, "activities": 3}
+
+        client.delete(f"/activities/{quote('Chess Club')}/participants/{quote(email)}")
+
+        data = client.get("/stats").json()
+        assert data["total_enrollments"] == 21
+        assert data["activities"]["Chess Club"]["participants"] == 3
+        assert data["most_active_students"][0] == {"email": email, "activities": 2}
+
+    def test_stats_ignore_failed_requests(self, client, reset_activities, sample_activity_name):
+        """Test that rejected signups do not change the statistics"""
+        client.post(
+            f"/activities/{quote(sample_activity_name)}/signup",
+            params={"email": "michael@mergington.edu"}  # Already in Chess Club
+        )
+
+        assert client.get("/stats").json()["total_enrollments"] == 18
+
+    def test_stats_top_limit(self, client, reset_activities):
+        """Test limiting the number of ranked entries"""
+        data = client.get("/stats", params={"top": 3}).json()
+
+        assert len(data["most_popular_activities"]) == 3
+        assert len(data["most_active_students"]) == 3
+
+    def test_stats_invalid_top(self, client, reset_activities):
+        """Test that out-of-range rankings are rejected"""
+        response = client.get("/stats", params={"top": 0})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestLeaderboard:
+    """Test cases for the incremental ranking structure behind /stats"""
+
+    def test_top_orders_by_count(self):
+        """Test that top returns the highest counts first"""
+        board = Leaderboard()
+        for key in ["a", "b", "b", "c", "c", "c"]:
+            board.increment(key)
+
+        assert board.top(2) == [("c", 3), ("b", 2)]
+        assert board.total == 6
+
+    def test_decrement_lowers_max(self):
+        """Test that removing the last key at the top lowers the maximum"""
+        board = Leaderboard()
+        board.increment("a")
+        board.increment("a")
+        board.increment("b")
+        board.decrement("a")
+        board.decrement("a")
+
+        assert board.top(5) == [("b", 1)]
+        assert "a" not in board.counts
+        assert board.max_count == 1
+
+    def test_decrement_unknown_key(self):
+        """Test that decrementing a missing key is a no-op"""
+        board = Leaderboard()
+        board.decrement("missing")
+
+        assert board.top(5) == []
+        assert board.total == 0
+
+
+class TestStatsConcurrency:
+    """Test cases for updating the statistics from many threads at once"""
+
+    def test_concurrent_updates_on_one_key(self, reset_activities):
+        """Test that concurrent signups and removals on one key stay consistent"""
+        threads_count = 8
+        rounds = 5000
+
+        def hammer():
+            for _ in range(rounds):
+                app_module.count_signup("Chess Club", "busy@mergington.edu")
+                app_module.count_signup("Chess Club", "busy@mergington.edu")
+                app_module.count_removal("Chess Club", "busy@mergington.edu")
+
+        threads = [threading.Thread(target=hammer) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = threads_count * rounds
+        assert app_module.student_counts.counts["busy@mergington.edu"] == expected
+        assert app_module.activity_counts.counts["Chess Club"] == 2 + expected
+        assert app_module.activity_counts.total == 18 + expected
+        assert app_module.student_counts.top(1) == [("busy@mergington.edu", expected)]